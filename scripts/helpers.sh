@@ -3,7 +3,14 @@
 
 # State directory for tracking Claude sessions
 # Allow override via environment variable for testing
-STATE_DIR="${STATE_DIR:-${HOME}/.claude/tmux-stat}"
+# State files are rewritten on every event, so prefer tmpfs ($XDG_RUNTIME_DIR)
+if [[ -z "${STATE_DIR:-}" ]]; then
+    if [[ -n "${XDG_RUNTIME_DIR:-}" && -d "${XDG_RUNTIME_DIR}" ]]; then
+        STATE_DIR="${XDG_RUNTIME_DIR}/tmux-stat"
+    else
+        STATE_DIR="${HOME}/.claude/tmux-stat"
+    fi
+fi
 
 # Ensure state directory exists
 ensure_state_dir() {
@@ -7,7 +7,12 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PLUGIN_DIR="$(dirname "$SCRIPT_DIR")"
 CLAUDE_SETTINGS="${HOME}/.claude/settings.json"
 CODEX_CONFIG="${HOME}/.codex/config.toml"
-STATE_DIR="${HOME}/.claude/tmux-stat"
+# Must match STATE_DIR in helpers.sh
+if [[ -n "${XDG_RUNTIME_DIR:-}" && -d "${XDG_RUNTIME_DIR}" ]]; then
+    STATE_DIR="${XDG_RUNTIME_DIR}/tmux-stat"
+else
+    STATE_DIR="${HOME}/.claude/tmux-stat"
+fi
 
 # Colors for output
 RED='\033[0;31m'
@@ -307,7 +312,7 @@ uninstall_codex_otel() {
     fi
 
     # Stop receiver if running
-    local pid_file="${STATE_DIR}/otel-receiver.pid"
+    local pid_file="${HOME}/.claude/tmux-stat/otel-receiver.pid"
     if [[ -f "$pid_file" ]]; then
         local pid
         pid=$(cat "$pid_file" 2>/dev/null || echo "")
@@ -497,7 +502,7 @@ ${YELLOW}Manual Testing:${NC}
    curl http://localhost:4319/health
 
 3. Run the wrapper in a tmux pane and check state files:
-   ls -la ~/.claude/tmux-stat/
+   ls -la ${STATE_DIR}/
 
 ${YELLOW}Receiver Auto-shutdown:${NC}
 The receiver automatically shuts down after 5 minutes of inactivity.
@@ -531,11 +536,16 @@ uninstall() {
         info "Hooks removed from Claude settings"
     fi
 
-    # Clean up state files
-    if [[ -d "$STATE_DIR" ]]; then
-        rm -rf "$STATE_DIR"
-        info "State directory removed"
-    fi
+    # Clean up state files. ~/.claude/tmux-stat is removed even when state
+    # lives under $XDG_RUNTIME_DIR: it held state before the tmpfs default, and
+    # tmux-agentline.tmux still creates it for the OTEL receiver's pid file.
+    local state_dir
+    for state_dir in "$STATE_DIR" "${HOME}/.claude/tmux-stat"; do
+        if [[ -d "$state_dir" ]]; then
+            rm -rf "$state_dir"
+            info "State directory removed: ${state_dir}"
+        fi
+    done
 
     info "Uninstallation complete"
 }
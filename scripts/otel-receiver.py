@@ -16,24 +16,265 @@ Usage:
 """
 
 import argparse
+import asyncio
 import base64
+import collections
+import heapq
 import json
 import os
+import queue
+import re
+import select
+import selectors
+import shlex
 import signal
+import socket
 import subprocess
 import sys
 import threading
 import time
+from dataclasses import dataclass
+from http import HTTPStatus
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from socketserver import ThreadingMixIn
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httptools
+except ImportError:
+    httptools = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    from google.protobuf.message import DecodeError as ProtobufDecodeError
+    from opentelemetry.proto.collector.logs.v1.logs_service_pb2 import (
+        ExportLogsServiceRequest,
+        ExportLogsServiceResponse,
+    )
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+        ExportTraceServiceRequest,
+        ExportTraceServiceResponse,
+    )
+except ImportError:
+    ProtobufDecodeError = None
+    ExportLogsServiceRequest = ExportLogsServiceResponse = None
+    ExportTraceServiceRequest = ExportTraceServiceResponse = None
+
 
 # Configuration
 DEFAULT_PORT = 4319
-DEFAULT_STATE_DIR = os.path.expanduser("~/.claude/tmux-stat")
+# State files are rewritten on every event, so prefer tmpfs ($XDG_RUNTIME_DIR);
+# must match STATE_DIR in helpers.sh
+if os.path.isdir(os.environ.get("XDG_RUNTIME_DIR", "")):
+    DEFAULT_STATE_DIR = os.path.join(os.environ["XDG_RUNTIME_DIR"], "tmux-stat")
+else:
+    DEFAULT_STATE_DIR = os.path.expanduser("~/.claude/tmux-stat")
 IDLE_TIMEOUT = 300  # 5 minutes
 STALE_MAPPING_TIMEOUT = 600  # 10 minutes
+WINDOW_CACHE_TTL = 60  # 1 minute
+REFRESH_DEBOUNCE = 0.1  # Coalesce status refreshes within 100ms
+STATE_REWRITE_INTERVAL = 30  # Rewrite unchanged state to keep its timestamp fresh
+TMUX_CONTROL_RETRY = 30  # Wait before retrying a failed tmux control mode client
+TMUX_COMMAND_TIMEOUT = 2  # Max wait for a tmux control mode response
+KEEPALIVE_TIMEOUT = 30  # Close idle keep-alive connections after 30 seconds
+REQUEST_TIMEOUT = 5  # Max wait for the rest of a request once it starts arriving
+WORKER_THREADS = 16  # Connections served concurrently
+MAX_QUEUED_CONNECTIONS = 64  # Accepted connections waiting for a worker before shedding load
+PANE_ID_PATTERN = re.compile(r"%\d+")  # tmux pane IDs, e.g. %12
+
+
+def json_loads(data: bytes):
+    """Decode JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Encode JSON to bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _tool_name(attributes: dict) -> str:
+    return attributes.get("tool_name", attributes.get("tool", ""))
+
+
+def _on_conversation_starts(attributes: dict) -> tuple[str | None, str]:
+    model = attributes.get("model", "")
+    return "running", f"Codex: {model}" if model else "Codex started"
+
+
+def _on_tool_decision(attributes: dict) -> tuple[str | None, str]:
+    tool = _tool_name(attributes)
+    status = attributes.get("status", "")
+    if status == "pending" or attributes.get("needs_approval"):
+        return "attention", f"Approve? {tool}" if tool else "Approval needed"
+    elif status == "approved":
+        return "running", f"Approved: {tool}" if tool else "Tool approved"
+    elif status == "denied":
+        return "done", f"Denied: {tool}" if tool else "Tool denied"
+    return None, ""
+
+
+def _on_tool_result(attributes: dict) -> tuple[str | None, str]:
+    tool = _tool_name(attributes)
+    success = attributes.get("success", True)
+    if not success or attributes.get("status", "") == "failed" or attributes.get("error"):
+        return "attention", f"Failed: {tool}" if tool else "Tool failed"
+    return "running", f"Ran: {tool}" if tool else "Tool completed"
+
+
+# Attribute keys read from OTLP records; everything else is skipped
+RECORD_ATTRIBUTES = frozenset({
+    "event.name",
+    "conversation_id",
+    "session_id",
+    "model",
+    "tool_name",
+    "tool",
+    "status",
+    "needs_approval",
+    "success",
+    "error",
+})
+
+# Codex OTEL event name -> handler returning (state, message)
+EVENT_HANDLERS = {
+    "codex.conversation_starts": _on_conversation_starts,
+    "codex.tool_decision": _on_tool_decision,
+    "codex.tool_result": _on_tool_result,
+    "codex.conversation_ends": lambda attributes: ("done", "Codex finished"),
+    # Response generation - still running
+    "codex.response": lambda attributes: ("running", "Generating..."),
+    "codex.user_input_required": lambda attributes: ("attention", "Input needed"),
+}
+
+
+@dataclass(slots=True)
+class Mapping:
+    """A registered pane, keyed by conversation ID (or pending_<pane_id>)."""
+
+    pane_id: str
+    registered_at: float
+    conversation_id: str | None = None
+
+    def __post_init__(self):
+        # Interned so hot lookups and comparisons can short-circuit on identity.
+        # sys.intern only takes str; callers normalise IDs (see _extract_event)
+        # but a stray type must not fail registration or a pending claim.
+        if type(self.pane_id) is str:
+            self.pane_id = sys.intern(self.pane_id)
+        if type(self.conversation_id) is str:
+            self.conversation_id = sys.intern(self.conversation_id)
+
+
+class TmuxControl:
+    """Persistent tmux control mode client (tmux -C).
+
+    Commands are written to the client's stdin and their output parsed from
+    the %begin/%end blocks on stdout, avoiding a tmux fork/exec per command.
+    """
+
+    def __init__(self):
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+        self._buffer = bytearray()
+        self.client_name = ""
+
+    def command(self, command: str) -> list[str] | None:
+        """Run a tmux command and return its output lines, or None if it failed.
+
+        Raises OSError if the control client is unavailable, and ValueError for
+        commands spanning multiple lines, which tmux would run as separate commands.
+        """
+        if "\n" in command or "\r" in command:
+            raise ValueError("tmux control command must be a single line")
+        with self._lock:
+            try:
+                if self._proc is None:
+                    if time.time() < self._retry_at:
+                        raise OSError("tmux control client unavailable")
+                    self._start()
+                return self._run(command)
+            except OSError:
+                self._close()
+                self._retry_at = time.time() + TMUX_CONTROL_RETRY
+                raise
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            ["tmux", "-C", "attach"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        # Commands sent before attach completes run without a client,
+        # so wait for the attach command's own response block
+        if self._read_block() is None:
+            raise OSError("tmux control client failed to attach")
+        # Don't stream pane output to us (tmux 3.2+, fails harmlessly before)
+        self._run("refresh-client -f no-output")
+        self.client_name = (self._run("display-message -p '#{client_name}'") or [""])[0]
+
+    def _run(self, command: str) -> list[str] | None:
+        self._proc.stdin.write(command.encode() + b"\n")
+        self._proc.stdin.flush()
+        return self._read_block()
+
+    def _read_block(self) -> list[str] | None:
+        deadline = time.monotonic() + TMUX_COMMAND_TIMEOUT
+        lines = None
+        while True:
+            line = self._readline(deadline).decode(errors="replace")
+            if lines is None:
+                # Skip notifications outside a response block
+                if line.startswith("%begin"):
+                    lines = []
+            elif line.startswith("%end"):
+                return lines
+            elif line.startswith("%error"):
+                return None
+            else:
+                lines.append(line)
+
+    def _readline(self, deadline: float) -> bytes:
+        """Read one line from the client, raising OSError after the deadline."""
+        fd = self._proc.stdout.fileno()
+        while True:
+            end = self._buffer.find(b"\n")
+            if end >= 0:
+                line = bytes(self._buffer[:end])
+                del self._buffer[:end + 1]
+                return line
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise OSError("tmux control client timed out")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise OSError("tmux control client exited")
+            self._buffer += chunk
+
+    def _close(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=2)
+            except Exception:
+                pass
+            self._proc = None
+        self._buffer.clear()
 
 
 class OTELReceiver:
@@ -44,12 +285,44 @@ class OTELReceiver:
         self.state_dir.mkdir(parents=True, exist_ok=True)
 
         # conversation_id -> pane_id mapping
-        self.mappings: dict[str, dict] = {}
+        self.mappings: dict[str, Mapping] = {}
         self.mappings_lock = threading.Lock()
 
+        # Indexes over mappings, guarded by mappings_lock: pane_id -> mapping keys,
+        # and pending_* keys in registration order
+        self.pane_to_keys: dict[str, set[str]] = {}
+        self.pending_keys: collections.deque[str] = collections.deque()
+
+        # Min-heap of (expires_at, mapping_key), guarded by mappings_lock.
+        # Entries for keys that were since removed or re-registered are
+        # skipped when popped.
+        self._expiry: list[tuple[float, str]] = []
+        self._expiry_changed = threading.Condition(self.mappings_lock)
+
+        # pane_id -> (window_id, looked_up_at) cache to avoid spawning tmux per event
+        self.window_cache: dict[str, tuple[str, float]] = {}
+        self._window_lookups_pending: set[str] = set()
+        self.window_cache_lock = threading.Lock()
+
+        # Per-pane write state, guarded by state_lock:
+        # pane_id -> ((status, session_id, tmux_window, message), written_at),
+        # open state file descriptors, and reusable state dicts
+        self.last_state: dict[str, tuple[tuple, float]] = {}
+        self._state_fds: dict[str, int] = {}
+        self._state_buf: dict[str, dict] = {}
+        self.state_lock = threading.Lock()
+
         # Track last activity for idle shutdown
         self.last_activity = time.time()
 
+        # All tmux subprocesses run on one worker thread so request handling
+        # never waits on fork/exec. Refreshes are coalesced while one is queued.
+        self._tmux_queue: queue.Queue[tuple[str, tuple]] = queue.Queue()
+        self._refresh_pending = threading.Event()
+        self._tmux_control = TmuxControl()
+        self._tmux_thread = threading.Thread(target=self._tmux_worker, daemon=True)
+        self._tmux_thread.start()
+
     def touch_activity(self):
         """Update last activity timestamp."""
         self.last_activity = time.time()
@@ -58,30 +331,40 @@ class OTELReceiver:
         """Check if server has been idle beyond timeout."""
         return time.time() - self.last_activity > IDLE_TIMEOUT
 
+    def wait_until_idle(self):
+        """Block until the idle timeout is reached, expiring stale mappings on the way.
+
+        Sleeps until the next mapping expiry or idle deadline instead of polling.
+        """
+        while True:
+            self.cleanup_stale_mappings()
+            if self.is_idle():
+                return
+            with self._expiry_changed:
+                deadline = self.last_activity + IDLE_TIMEOUT
+                if self._expiry:
+                    deadline = min(deadline, self._expiry[0][0])
+                self._expiry_changed.wait(max(deadline - time.time(), 0))
+
     def register_pane(self, pane_id: str, conversation_id: str = None) -> str:
         """Register a pane, optionally with a conversation ID."""
         self.touch_activity()
         with self.mappings_lock:
             # Generate a temporary ID if no conversation ID yet
             mapping_key = conversation_id or f"pending_{pane_id}"
-            self.mappings[mapping_key] = {
-                "pane_id": pane_id,
-                "registered_at": time.time(),
-                "conversation_id": conversation_id,
-            }
+            self._set_mapping_locked(mapping_key, Mapping(pane_id, time.time(), conversation_id))
             return mapping_key
 
     def unregister_pane(self, pane_id: str):
         """Unregister a pane and remove its state file."""
         self.touch_activity()
         with self.mappings_lock:
-            # Find and remove all mappings for this pane
-            to_remove = [
-                k for k, v in self.mappings.items()
-                if v.get("pane_id") == pane_id
-            ]
-            for key in to_remove:
-                del self.mappings[key]
+            # Remove all mappings for this pane
+            for key in list(self.pane_to_keys.get(pane_id, ())):
+                self._delete_mapping_locked(key)
+
+        with self.window_cache_lock:
+            self.window_cache.pop(pane_id, None)
 
         # Remove state file
         self._remove_state(pane_id)
@@ -90,177 +373,373 @@ class OTELReceiver:
     def get_pane_for_conversation(self, conversation_id: str) -> str | None:
         """Look up pane ID for a conversation ID."""
         with self.mappings_lock:
-            mapping = self.mappings.get(conversation_id)
-            if mapping:
-                return mapping.get("pane_id")
-
-            # Also check pending mappings and update them
-            for key, value in list(self.mappings.items()):
-                if key.startswith("pending_") and not value.get("conversation_id"):
-                    # Update pending mapping with real conversation ID
-                    pane_id = value["pane_id"]
-                    self.mappings[conversation_id] = {
-                        "pane_id": pane_id,
-                        "registered_at": value["registered_at"],
-                        "conversation_id": conversation_id,
-                    }
-                    del self.mappings[key]
-                    return pane_id
-        return None
+            return self._resolve_pane_locked(conversation_id)
+
+    def _resolve_pane_locked(self, conversation_id: str) -> str | None:
+        """Look up pane ID for a conversation, claiming a pending mapping if needed.
+
+        Caller must hold mappings_lock.
+        """
+        mapping = self.mappings.get(conversation_id) if conversation_id else None
+        if mapping:
+            return mapping.pane_id
+
+        # Fall back to the oldest pending mapping
+        if not self.pending_keys:
+            return None
+        key = self.pending_keys[0]
+        value = self.mappings[key]
+        pane_id = value.pane_id
+        # Update pending mapping with real conversation ID; build the replacement
+        # first so a failure can't drop the pending entry
+        if conversation_id:
+            mapping = Mapping(pane_id, value.registered_at, conversation_id)
+            self._delete_mapping_locked(key)
+            self._set_mapping_locked(conversation_id, mapping)
+        return pane_id
+
+    def _set_mapping_locked(self, key: str, mapping: Mapping):
+        """Add or replace a mapping and keep the indexes in sync.
+
+        Caller must hold mappings_lock.
+        """
+        previous = self.mappings.get(key)
+        if previous:
+            self._unindex_pane_key_locked(previous.pane_id, key)
+        elif key.startswith("pending_"):
+            self.pending_keys.append(key)
+        self.mappings[key] = mapping
+        self.pane_to_keys.setdefault(mapping.pane_id, set()).add(key)
+
+        entry = (mapping.registered_at + STALE_MAPPING_TIMEOUT, key)
+        heapq.heappush(self._expiry, entry)
+        if self._expiry[0] is entry:
+            self._expiry_changed.notify()
+
+    def _delete_mapping_locked(self, key: str):
+        """Remove a mapping and its index entries.
+
+        Caller must hold mappings_lock.
+        """
+        mapping = self.mappings.pop(key, None)
+        if not mapping:
+            return
+        self._unindex_pane_key_locked(mapping.pane_id, key)
+        if key.startswith("pending_"):
+            # Usually the head of the deque, since pending mappings are claimed in order
+            self.pending_keys.remove(key)
+
+    def _unindex_pane_key_locked(self, pane_id: str, key: str):
+        """Drop a key from the pane_id -> keys index."""
+        keys = self.pane_to_keys.get(pane_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.pane_to_keys[pane_id]
 
     def cleanup_stale_mappings(self):
         """Remove mappings older than the stale timeout."""
         now = time.time()
+        panes = set()
         with self.mappings_lock:
-            to_remove = [
-                k for k, v in self.mappings.items()
-                if now - v.get("registered_at", 0) > STALE_MAPPING_TIMEOUT
-            ]
-            for key in to_remove:
-                del self.mappings[key]
-
-    def process_otel_data(self, data: dict):
-        """Process OTLP log/trace data and update state files."""
+            while self._expiry and self._expiry[0][0] < now:
+                _, key = heapq.heappop(self._expiry)
+                mapping = self.mappings.get(key)
+                if mapping and now - mapping.registered_at > STALE_MAPPING_TIMEOUT:
+                    panes.add(mapping.pane_id)
+                    self._delete_mapping_locked(key)
+            released = panes - self.pane_to_keys.keys()
+
+        # Nothing will write these panes' state files again
+        for pane_id in released:
+            self._release_state(pane_id)
+
+    def process_otel_data(self, body: bytes):
+        """Process an OTLP/JSON log/trace export and update state files.
+
+        Raises JSONDecodeError on malformed bodies.
+        """
         self.touch_activity()
 
+        # No pane could receive these events; skip decoding and extraction.
+        # Read without the lock: a stale answer only drops or parses one batch.
+        if not (body and self.mappings):
+            return
+
+        self._process_records(self._iter_records(json_loads(body)), self._extract_record)
+
+    @staticmethod
+    def _iter_records(data: dict):
+        """Yield every log record and span in an OTLP/JSON payload.
+
+        Missing levels default to () so no empty lists are allocated.
+        """
+        # Handle logs format
+        for resource_log in data.get("resourceLogs", ()):
+            for scope_log in resource_log.get("scopeLogs", ()):
+                yield from scope_log.get("logRecords", ())
+
+        # Handle traces format
+        for resource_span in data.get("resourceSpans", ()):
+            for scope_span in resource_span.get("scopeSpans", ()):
+                yield from scope_span.get("spans", ())
+
+    def process_otel_protobuf(self, path: str, body: bytes):
+        """Process an OTLP/protobuf export request and update state files.
+
+        /v1/traces carries an ExportTraceServiceRequest; other paths are
+        treated as ExportLogsServiceRequest. Raises ProtobufDecodeError on
+        malformed bodies.
+        """
+        self.touch_activity()
+
+        if not (body and self.mappings):
+            return
+
+        if path == "/v1/traces":
+            request = ExportTraceServiceRequest.FromString(body)
+        else:
+            request = ExportLogsServiceRequest.FromString(body)
+
+        self._process_records(
+            self._iter_proto_records(request), lambda entry: self._extract_proto_record(*entry)
+        )
+
+    @staticmethod
+    def _iter_proto_records(request):
+        """Yield (record, name) for every log record and span in an OTLP/protobuf request."""
+        # Only one of these is present, depending on the request type
+        for resource_log in getattr(request, "resource_logs", ()):
+            for scope_log in resource_log.scope_logs:
+                for log_record in scope_log.log_records:
+                    # Older opentelemetry-proto releases lack LogRecord.event_name
+                    yield log_record, getattr(log_record, "event_name", "")
+
+        for resource_span in getattr(request, "resource_spans", ()):
+            for scope_span in resource_span.scope_spans:
+                for span in scope_span.spans:
+                    yield span, span.name
+
+    def _process_records(self, records, extract):
+        """Extract every record and apply the batch.
+
+        A malformed record is logged and skipped, so the rest of the batch
+        still applies; a malformed container ends the traversal early.
+        """
+        extracted = []
+        try:
+            for record in records:
+                try:
+                    extracted.append(extract(record))
+                except Exception as e:
+                    print(f"Skipping malformed OTEL record: {e}", file=sys.stderr)
+        except Exception as e:
+            print(f"Error processing OTEL data: {e}", file=sys.stderr)
+
         try:
-            # Handle logs format
-            resource_logs = data.get("resourceLogs", [])
-            for resource_log in resource_logs:
-                scope_logs = resource_log.get("scopeLogs", [])
-                for scope_log in scope_logs:
-                    log_records = scope_log.get("logRecords", [])
-                    for log_record in log_records:
-                        self._process_record(log_record)
-
-            # Handle traces format
-            resource_spans = data.get("resourceSpans", [])
-            for resource_span in resource_spans:
-                scope_spans = resource_span.get("scopeSpans", [])
-                for scope_span in scope_spans:
-                    spans = scope_span.get("spans", [])
-                    for span in spans:
-                        self._process_record(span)
+            self._apply_extracted(extracted)
         except Exception as e:
             print(f"Error processing OTEL data: {e}", file=sys.stderr)
 
-    def _process_record(self, record: dict):
-        """Process a single OTLP log/span record."""
-        # Extract attributes
+    def _apply_extracted(self, extracted: list[tuple[str, str | None, str] | None]):
+        """Write the latest extracted state for each pane.
+
+        Records are reduced to the latest state per pane so each pane's state
+        file is written at most once per batch.
+        """
+        # Resolve panes under a single lock acquisition; later records win
+        latest: dict[str, tuple[str, str, str]] = {}
+        with self.mappings_lock:
+            for item in extracted:
+                if item is None:
+                    continue
+                conversation_id, state, message = item
+                pane_id = self._resolve_pane_locked(conversation_id)
+                if pane_id and state:
+                    latest[pane_id] = (state, conversation_id, message)
+
+        written = False
+        for pane_id, (state, conversation_id, message) in latest.items():
+            if self._write_state(pane_id, state, conversation_id, message):
+                written = True
+        if written:
+            self._refresh_tmux()
+
+    def _extract_record(self, record: dict) -> tuple[str, str | None, str] | None:
+        """Extract (conversation_id, state, message) from an OTLP/JSON log/span record.
+
+        Returns None for records without an event name.
+        """
+        # Extract only the attributes the event handlers consume
         attributes = {}
-        for attr in record.get("attributes", []):
+        remaining = len(RECORD_ATTRIBUTES)
+        for attr in record.get("attributes", ()):
             key = attr.get("key", "")
+            if key not in RECORD_ATTRIBUTES:
+                continue
             value = attr.get("value", {})
             # OTLP values have type wrappers
             if "stringValue" in value:
-                attributes[key] = value["stringValue"]
+                value = value["stringValue"]
             elif "intValue" in value:
-                attributes[key] = int(value["intValue"])
+                value = int(value["intValue"])
             elif "boolValue" in value:
-                attributes[key] = value["boolValue"]
+                value = value["boolValue"]
+            else:
+                continue
+            if key not in attributes:
+                remaining -= 1
+            attributes[key] = value
+            if not remaining:
+                break
 
-        # Get event name - check both attribute and span name field
-        event_name = attributes.get("event.name", "") or record.get("name", "")
+        # Check both the event.name attribute and the span name field
+        return self._extract_event(attributes, record.get("name", ""))
+
+    def _extract_proto_record(self, record, name: str) -> tuple[str, str | None, str] | None:
+        """Extract (conversation_id, state, message) from a protobuf LogRecord or Span."""
+        attributes = {}
+        for attr in record.attributes:
+            if attr.key not in RECORD_ATTRIBUTES:
+                continue
+            # Protobuf values are already typed; read whichever variant is set
+            kind = attr.value.WhichOneof("value")
+            if kind in ("string_value", "int_value", "bool_value"):
+                attributes[attr.key] = getattr(attr.value, kind)
+        return self._extract_event(attributes, name)
+
+    def _extract_event(self, attributes: dict, name: str) -> tuple[str, str | None, str] | None:
+        """Map extracted record attributes to (conversation_id, state, message)."""
+        event_name = attributes.get("event.name", "") or name
         conversation_id = attributes.get("conversation_id", "") or attributes.get("session_id", "")
+        if not isinstance(conversation_id, str):
+            # intValue/boolValue (JSON) or int_value/bool_value (protobuf) IDs;
+            # mapping keys and interned Mapping fields are always strings
+            conversation_id = str(conversation_id)
 
         if not event_name:
-            return
-
-        # Get pane ID for this conversation
-        pane_id = self.get_pane_for_conversation(conversation_id)
-        if not pane_id:
-            # Try to find any pending mapping
-            with self.mappings_lock:
-                for key, value in self.mappings.items():
-                    if key.startswith("pending_"):
-                        pane_id = value["pane_id"]
-                        # Update with real conversation ID
-                        if conversation_id:
-                            self.mappings[conversation_id] = {
-                                "pane_id": pane_id,
-                                "registered_at": value["registered_at"],
-                                "conversation_id": conversation_id,
-                            }
-                            del self.mappings[key]
-                        break
-
-        if not pane_id:
-            return
+            return None
 
         # Map event to state
         state, message = self._map_event_to_state(event_name, attributes)
-        if state:
-            self._write_state(pane_id, state, conversation_id, message)
-            self._refresh_tmux()
+        return conversation_id, state, message
 
     def _map_event_to_state(self, event_name: str, attributes: dict) -> tuple[str | None, str]:
         """Map Codex OTEL event to tmux-stat state."""
-        model = attributes.get("model", "")
-        tool = attributes.get("tool_name", attributes.get("tool", ""))
-        status = attributes.get("status", "")
-
-        if event_name == "codex.conversation_starts":
-            msg = f"Codex: {model}" if model else "Codex started"
-            return "running", msg
-
-        elif event_name == "codex.tool_decision":
-            if status == "pending" or attributes.get("needs_approval"):
-                return "attention", f"Approve? {tool}" if tool else "Approval needed"
-            elif status == "approved":
-                return "running", f"Approved: {tool}" if tool else "Tool approved"
-            elif status == "denied":
-                return "done", f"Denied: {tool}" if tool else "Tool denied"
-
-        elif event_name == "codex.tool_result":
-            success = attributes.get("success", True)
-            if not success or status == "failed" or attributes.get("error"):
-                return "attention", f"Failed: {tool}" if tool else "Tool failed"
-            return "running", f"Ran: {tool}" if tool else "Tool completed"
-
-        elif event_name == "codex.conversation_ends":
-            return "done", "Codex finished"
-
-        elif event_name == "codex.response":
-            # Response generation - still running
-            return "running", "Generating..."
-
-        elif event_name == "codex.user_input_required":
-            return "attention", "Input needed"
-
+        handler = EVENT_HANDLERS.get(event_name)
+        if handler:
+            return handler(attributes)
         return None, ""
 
-    def _write_state(self, pane_id: str, status: str, session_id: str, message: str):
-        """Write state to a pane's state file."""
+    def _write_state(self, pane_id: str, status: str, session_id: str, message: str) -> bool:
+        """Write state to a pane's state file.
+
+        Returns False when the state is unchanged and the file was written
+        recently enough that its timestamp won't be considered stale.
+        """
         safe_id = pane_id.lstrip("%")
         state_file = self.state_dir / f"{safe_id}.state"
 
-        # Get tmux window for this pane (always try, don't require $TMUX)
-        tmux_window = ""
+        now = time.time()
+        with self.state_lock:
+            # Read the window under state_lock so a lookup finishing concurrently
+            # either lands in this write or sees this state and patches it
+            tmux_window = self._get_tmux_window(pane_id)
+            key = (status, session_id, tmux_window, message)
+            last = self.last_state.get(pane_id)
+            if last and last[0] == key and now - last[1] < STATE_REWRITE_INTERVAL:
+                return False
+
+            # Reuse the pane's state dict; keys keep their first insertion order
+            state = self._state_buf.setdefault(pane_id, {})
+            state["status"] = status
+            state["timestamp"] = int(now)
+            state["session_id"] = session_id
+            state["tmux_window"] = tmux_window
+            state["message"] = message
+
+            self._write_state_file(pane_id, state_file, json_dumps(state))
+            self.last_state[pane_id] = (key, now)
+        return True
+
+    def _write_state_file(self, pane_id: str, state_file: Path, payload: bytes):
+        """Overwrite a pane's state file through a cached descriptor.
+
+        Status files are rewritten on every event, so durability doesn't
+        matter: nothing is flushed or synced. Caller must hold state_lock.
+        """
+        fd = self._state_fds.get(pane_id)
+        if fd is not None and os.fstat(fd).st_nlink == 0:
+            # File was removed behind our back (e.g. stale cleanup); recreate it
+            os.close(fd)
+            fd = None
+        if fd is None:
+            fd = os.open(state_file, os.O_WRONLY | os.O_CREAT, 0o644)
+            self._state_fds[pane_id] = fd
         try:
-            result = subprocess.run(
-                ["tmux", "display-message", "-t", pane_id, "-p", "#{window_id}"],
-                capture_output=True,
-                text=True,
-                timeout=2,
-            )
-            if result.returncode == 0:
-                tmux_window = result.stdout.strip()
-        except Exception:
-            pass
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, payload, 0)
+        except OSError:
+            del self._state_fds[pane_id]
+            os.close(fd)
+            raise
+
+    def _get_tmux_window(self, pane_id: str) -> str:
+        """Return the cached tmux window for a pane without blocking.
+
+        Missing or expired entries are resolved on the tmux worker, which
+        patches the pane's state file once the window is known.
+        """
+        now = time.time()
+        with self.window_cache_lock:
+            cached = self.window_cache.get(pane_id)
+            if cached and now - cached[1] < WINDOW_CACHE_TTL:
+                return cached[0]
+            if pane_id not in self._window_lookups_pending:
+                self._window_lookups_pending.add(pane_id)
+                self._tmux_queue.put(("window_lookup", (pane_id,)))
+        # Fall back to the expired entry until the lookup completes
+        return cached[0] if cached else ""
+
+    def _lookup_tmux_window(self, pane_id: str):
+        """Resolve a pane's tmux window and update its state file if it changed."""
+        # Always try, don't require $TMUX
+        output = self._run_tmux(["display-message", "-t", pane_id, "-p", "#{window_id}"])
+        tmux_window = output[0].strip() if output else ""
+
+        with self.window_cache_lock:
+            self._window_lookups_pending.discard(pane_id)
+            # Only cache successful lookups so a pane seen before tmux is
+            # reachable gets its window on the next event
+            if tmux_window:
+                self.window_cache[pane_id] = (tmux_window, time.time())
+        if not tmux_window:
+            return
 
-        state = {
-            "status": status,
-            "timestamp": int(time.time()),
-            "session_id": session_id,
-            "tmux_window": tmux_window,
-            "message": message,
-        }
+        safe_id = pane_id.lstrip("%")
+        state_file = self.state_dir / f"{safe_id}.state"
+        with self.state_lock:
+            state = self._state_buf.get(pane_id)
+            if not state or state["tmux_window"] == tmux_window:
+                return
+            state["tmux_window"] = tmux_window
+            self._write_state_file(pane_id, state_file, json_dumps(state))
+            key = (state["status"], state["session_id"], tmux_window, state["message"])
+            self.last_state[pane_id] = (key, self.last_state[pane_id][1])
+        self._refresh_tmux()
 
-        with open(state_file, "w") as f:
-            json.dump(state, f)
+    def _release_state(self, pane_id: str):
+        """Close a pane's state file descriptor and forget its cached state."""
+        with self.state_lock:
+            self.last_state.pop(pane_id, None)
+            self._state_buf.pop(pane_id, None)
+            fd = self._state_fds.pop(pane_id, None)
+        if fd is not None:
+            os.close(fd)
 
     def _remove_state(self, pane_id: str):
         """Remove a pane's state file."""
+        self._release_state(pane_id)
         safe_id = pane_id.lstrip("%")
         state_file = self.state_dir / f"{safe_id}.state"
         try:
@@ -269,32 +748,204 @@ class OTELReceiver:
             pass
 
     def _refresh_tmux(self):
-        """Trigger tmux status line refresh."""
+        """Schedule a tmux status line refresh."""
+        if os.environ.get("TMUX") and not self._refresh_pending.is_set():
+            self._refresh_pending.set()
+            self._tmux_queue.put(("refresh", ()))
+
+    def _run_tmux(self, args: list[str]) -> list[str] | None:
+        """Run a tmux command and return its output lines, or None if it failed.
+
+        Inside tmux this goes through the control mode client; otherwise, or
+        if that client is unavailable, it spawns tmux.
+        """
         if os.environ.get("TMUX"):
             try:
-                subprocess.run(
-                    ["tmux", "refresh-client", "-S"],
-                    capture_output=True,
-                    timeout=2,
-                )
-            except Exception:
+                return self._tmux_control.command(shlex.join(args))
+            except ValueError:
+                return None
+            except OSError:
                 pass
+        try:
+            result = subprocess.run(
+                ["tmux", *args],
+                capture_output=True,
+                text=True,
+                timeout=2,
+            )
+        except Exception:
+            return None
+        return result.stdout.splitlines() if result.returncode == 0 else None
+
+    def _refresh_clients(self):
+        """Refresh the status line of attached tmux clients."""
+        try:
+            clients = self._tmux_control.command("list-clients -F '#{client_name}'")
+            # refresh-client without a target would refresh the control client itself
+            for client in clients or ():
+                if client != self._tmux_control.client_name:
+                    self._tmux_control.command(shlex.join(["refresh-client", "-S", "-t", client]))
+        except OSError:
+            subprocess.run(
+                ["tmux", "refresh-client", "-S"],
+                capture_output=True,
+                timeout=2,
+            )
+
+    def _tmux_worker(self):
+        """Run queued tmux commands; refreshes are debounced by REFRESH_DEBOUNCE."""
+        while True:
+            command, args = self._tmux_queue.get()
+            try:
+                if command == "window_lookup":
+                    self._lookup_tmux_window(*args)
+                elif command == "refresh":
+                    time.sleep(REFRESH_DEBOUNCE)
+                    self._refresh_pending.clear()
+                    self._refresh_clients()
+            except Exception as e:
+                print(f"Error running tmux {command}: {e}", file=sys.stderr)
+
+
+def handle_request(
+    receiver: OTELReceiver, method: str, path: str, body: bytes, content_type: str = ""
+) -> tuple[int, dict | bytes]:
+    """Route a request to the receiver and return (status, body).
+
+    The body is a dict to send as JSON, or serialized OTLP/protobuf bytes
+    when answering a protobuf export. Shared by the http.server and
+    httptools front ends.
+    """
+    try:
+        if method == "GET":
+            if path == "/health":
+                return 200, {
+                    "status": "ok",
+                    "mappings": len(receiver.mappings),
+                    "idle_seconds": int(time.time() - receiver.last_activity),
+                }
+            return 404, {"error": "not found"}
+
+        if method != "POST":
+            return 501, {"error": "unsupported method"}
+
+        if path in ("/v1/logs", "/v1/traces", "/"):
+            # OTLP logs/traces endpoint - accept all and process
+            protobuf = content_type.startswith("application/x-protobuf")
+            if protobuf and ExportLogsServiceRequest is None:
+                return 415, {"error": "protobuf requires opentelemetry-proto"}
+
+            if protobuf:
+                try:
+                    receiver.process_otel_protobuf(path, body)
+                except ProtobufDecodeError:
+                    return 400, {"error": "invalid protobuf"}
+                # Exporters decode the response with the request's encoding
+                if path == "/v1/traces":
+                    return 200, ExportTraceServiceResponse().SerializeToString()
+                return 200, ExportLogsServiceResponse().SerializeToString()
+
+            receiver.process_otel_data(body)
+            return 200, {"status": "ok"}
+
+        elif path == "/register":
+            # Pane registration
+            data = json_loads(body) if body else {}
+            pane_id = data.get("pane_id")
+            conversation_id = data.get("conversation_id")
+
+            if not pane_id:
+                return 400, {"error": "pane_id required"}
+            if not isinstance(pane_id, str) or not PANE_ID_PATTERN.fullmatch(pane_id):
+                return 400, {"error": "invalid pane_id"}
+            if conversation_id is not None and not isinstance(conversation_id, str):
+                return 400, {"error": "invalid conversation_id"}
+
+            mapping_key = receiver.register_pane(pane_id, conversation_id)
+            return 200, {"status": "registered", "mapping_key": mapping_key}
+
+        elif path == "/unregister":
+            # Pane unregistration
+            data = json_loads(body) if body else {}
+            pane_id = data.get("pane_id")
+
+            if not pane_id:
+                return 400, {"error": "pane_id required"}
+            if not isinstance(pane_id, str) or not PANE_ID_PATTERN.fullmatch(pane_id):
+                return 400, {"error": "invalid pane_id"}
+
+            receiver.unregister_pane(pane_id)
+            return 200, {"status": "unregistered"}
+
+        return 200, {"status": "ok"}  # Accept unknown paths silently
+
+    except json.JSONDecodeError:  # Also raised by orjson
+        return 400, {"error": "invalid JSON"}
+    except Exception as e:
+        return 500, {"error": str(e)}
+
+
+def encode_response_body(body: dict | bytes | None) -> tuple[str, bytes]:
+    """Return (Content-Type, payload) for a handle_request response body."""
+    if isinstance(body, bytes):
+        return "application/x-protobuf", body
+    return "application/json", json_dumps(body) if body else b""
 
 
 class OTELRequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler for OTEL receiver."""
 
+    # Keep connections open between OTLP exports instead of reconnecting per batch.
+    # Idle connections are parked with the server rather than holding a worker.
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+    parked = False
+
     # Suppress default logging
     def log_message(self, format, *args):
         pass
 
-    def _send_response(self, status: int, body: dict = None):
-        """Send a JSON response."""
+    def handle(self):
+        """Serve the pending requests, then park the connection if it stays open."""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self._input_pending():
+                self.parked = True
+                return
+            self.handle_one_request()
+
+    def finish(self):
+        if not self.parked:
+            super().finish()
+
+    def resume(self):
+        """Serve a parked connection that became readable."""
+        self.parked = False
+        try:
+            self.handle()
+        finally:
+            self.finish()
+
+    def _input_pending(self) -> bool:
+        """Check for pipelined request data without blocking."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def _send_response(self, status: int, body: dict | bytes = None):
+        """Send a JSON or serialized protobuf response."""
+        content_type, payload = encode_response_body(body)
         self.send_response(status)
-        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
-        if body:
-            self.wfile.write(json.dumps(body).encode())
+        if payload:
+            self.wfile.write(payload)
 
     def _read_body(self) -> bytes:
         """Read request body."""
@@ -303,63 +954,130 @@ class OTELRequestHandler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         """Handle GET requests."""
-        if self.path == "/health":
-            self._send_response(200, {
-                "status": "ok",
-                "mappings": len(self.server.receiver.mappings),
-                "idle_seconds": int(time.time() - self.server.receiver.last_activity),
-            })
-        else:
-            self._send_response(404, {"error": "not found"})
+        self._send_response(*handle_request(self.server.receiver, "GET", self.path, b""))
 
     def do_POST(self):
         """Handle POST requests."""
         try:
             body = self._read_body()
+        except Exception as e:
+            # The request body was not consumed; don't reuse the connection
+            self.close_connection = True
+            self._send_response(500, {"error": str(e)})
+            return
 
-            if self.path in ("/v1/logs", "/v1/traces", "/"):
-                # OTLP logs/traces endpoint - accept all and process
-                data = json.loads(body) if body else {}
-                self.server.receiver.process_otel_data(data)
-                self._send_response(200, {"status": "ok"})
-
-            elif self.path == "/register":
-                # Pane registration
-                data = json.loads(body) if body else {}
-                pane_id = data.get("pane_id")
-                conversation_id = data.get("conversation_id")
-
-                if not pane_id:
-                    self._send_response(400, {"error": "pane_id required"})
-                    return
+        content_type = self.headers.get("Content-Type", "")
+        self._send_response(*handle_request(self.server.receiver, "POST", self.path, body, content_type))
 
-                mapping_key = self.server.receiver.register_pane(pane_id, conversation_id)
-                self._send_response(200, {"status": "registered", "mapping_key": mapping_key})
 
-            elif self.path == "/unregister":
-                # Pane unregistration
-                data = json.loads(body) if body else {}
-                pane_id = data.get("pane_id")
+class ThreadPoolMixIn(ThreadingMixIn):
+    """Serve connections from a fixed pool of daemon worker threads.
 
-                if not pane_id:
-                    self._send_response(400, {"error": "pane_id required"})
-                    return
+    Connections wait in a selector until they are readable, so idle keep-alive
+    connections don't tie up workers. Connections that become readable while
+    the queue is full get a 503 instead of spawning more threads.
+    """
+    daemon_threads = True
+    pool_size = WORKER_THREADS
+    queue_size = MAX_QUEUED_CONNECTIONS
+
+    _busy_body = json_dumps({"error": "server busy"})
+    _busy_response = (
+        b"HTTP/1.1 503 Service Unavailable\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: " + str(len(_busy_body)).encode() + b"\r\n"
+        b"Connection: close\r\n"
+        b"\r\n" + _busy_body
+    )
 
-                self.server.receiver.unregister_pane(pane_id)
-                self._send_response(200, {"status": "unregistered"})
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connections = queue.Queue(self.queue_size)
+        # Connections handed to the selector thread, which is woken via a socketpair
+        self._parking = queue.SimpleQueue()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_send.setblocking(False)
+        threading.Thread(target=self._selector_loop, daemon=True).start()
+        for _ in range(self.pool_size):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def process_request(self, request, client_address):
+        """Wait for the connection to send a request before handing it to a worker."""
+        self._park(request, client_address, None)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def _park(self, request, client_address, handler):
+        self._parking.put((request, client_address, handler))
+        try:
+            self._wakeup_send.send(b"\0")
+        except BlockingIOError:
+            pass  # A wakeup is already pending
+
+    def _selector_loop(self):
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._wakeup_recv, selectors.EVENT_READ)
+            while True:
+                for key, _ in selector.select(timeout=1):
+                    if key.fileobj is self._wakeup_recv:
+                        self._wakeup_recv.recv(4096)
+                        continue
+                    selector.unregister(key.fileobj)
+                    request, client_address, handler, _ = key.data
+                    self._dispatch(request, client_address, handler)
+
+                now = time.monotonic()
+                while not self._parking.empty():
+                    request, client_address, handler = self._parking.get()
+                    selector.register(request, selectors.EVENT_READ,
+                                      (request, client_address, handler, now + KEEPALIVE_TIMEOUT))
+
+                expired = [key for key in selector.get_map().values()
+                           if key.data is not None and key.data[3] <= now]
+                for key in expired:
+                    selector.unregister(key.fileobj)
+                    request, _, handler, _ = key.data
+                    self._close(request, handler)
+
+    def _dispatch(self, request, client_address, handler):
+        """Queue a readable connection for a worker, or reject it if the pool is saturated."""
+        try:
+            self._connections.put_nowait((request, client_address, handler))
+        except queue.Full:
+            try:
+                request.sendall(self._busy_response)
+            except OSError:
+                pass
+            self._close(request, handler)
 
-            else:
-                self._send_response(200, {"status": "ok"})  # Accept unknown paths silently
+    def _close(self, request, handler):
+        if handler is not None:
+            handler.parked = False
+            try:
+                handler.finish()
+            except OSError:
+                pass
+        self.shutdown_request(request)
 
-        except json.JSONDecodeError:
-            self._send_response(400, {"error": "invalid JSON"})
-        except Exception as e:
-            self._send_response(500, {"error": str(e)})
+    def _worker(self):
+        while True:
+            request, client_address, handler = self._connections.get()
+            try:
+                if handler is None:
+                    handler = self.finish_request(request, client_address)
+                else:
+                    handler.resume()
+                if handler.parked:
+                    self._park(request, client_address, handler)
+                    continue
+            except Exception:
+                self.handle_error(request, client_address)
+            self.shutdown_request(request)
 
 
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Threaded HTTP server."""
-    daemon_threads = True
+class ThreadedHTTPServer(ThreadPoolMixIn, HTTPServer):
+    """Thread pool HTTP server."""
 
 
 class OTELHTTPServer(ThreadedHTTPServer):
@@ -370,9 +1088,139 @@ class OTELHTTPServer(ThreadedHTTPServer):
         self.receiver = receiver
 
 
+class HTTPToolsConnection:
+    """httptools parser callbacks for one connection, queueing complete requests."""
+
+    def __init__(self):
+        self.parser = httptools.HttpRequestParser(self)
+        self.requests: list[tuple[str, str, bytes, str, bool]] = []
+        self._url = b""
+        self._body: list[bytes] = []
+        self._content_type = b""
+        self.expect_continue = False
+
+    def on_url(self, url: bytes):
+        self._url += url
+
+    def on_header(self, name: bytes, value: bytes):
+        name = name.lower()
+        if name == b"content-type":
+            self._content_type = value
+        elif name == b"expect" and value.lower() == b"100-continue":
+            self.expect_continue = True
+
+    def on_body(self, body: bytes):
+        self._body.append(body)
+
+    def on_message_complete(self):
+        self.requests.append((
+            self.parser.get_method().decode(),
+            self._url.decode("latin-1"),
+            b"".join(self._body),
+            self._content_type.decode("latin-1"),
+            self.parser.should_keep_alive(),
+        ))
+        self._url = b""
+        self._body = []
+        self._content_type = b""
+
+
+def format_response(status: int, body: dict | bytes, keep_alive: bool) -> bytes:
+    """Serialize a response for the httptools front end."""
+    content_type, payload = encode_response_body(body)
+    return (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    ).encode() + payload
+
+
+async def serve_connection(receiver: OTELReceiver, reader, writer):
+    """Serve HTTP/1.1 requests on one connection until it closes or idles out."""
+    connection = HTTPToolsConnection()
+    try:
+        keep_alive = True
+        while keep_alive:
+            data = await asyncio.wait_for(reader.read(65536), KEEPALIVE_TIMEOUT)
+            if not data:
+                break
+            try:
+                connection.parser.feed_data(data)
+            except httptools.HttpParserError:
+                writer.write(format_response(400, {"error": "bad request"}, False))
+                break
+
+            if connection.expect_continue:
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                connection.expect_continue = False
+
+            for method, path, body, content_type, keep_alive in connection.requests:
+                status, response = handle_request(receiver, method, path, body, content_type)
+                writer.write(format_response(status, response, keep_alive))
+                if not keep_alive:
+                    break
+            connection.requests.clear()
+            await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_httptools(receiver: OTELReceiver, port: int):
+    """Run the single-threaded httptools front end until a signal or idle timeout."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+
+    server = await asyncio.start_server(
+        lambda reader, writer: serve_connection(receiver, reader, writer),
+        "127.0.0.1",
+        port,
+    )
+
+    print(f"OTEL receiver listening on http://127.0.0.1:{port} (httptools)", file=sys.stderr)
+    print(f"State directory: {receiver.state_dir}", file=sys.stderr)
+
+    # Set up signal handlers for graceful shutdown
+    def shutdown():
+        print("\nShutting down...", file=sys.stderr)
+        stop.set()
+
+    loop.add_signal_handler(signal.SIGINT, shutdown)
+    loop.add_signal_handler(signal.SIGTERM, shutdown)
+
+    # Start idle checker thread
+    def idle_checker():
+        receiver.wait_until_idle()
+        print("Idle timeout reached, shutting down...", file=sys.stderr)
+        loop.call_soon_threadsafe(stop.set)
+
+    checker_thread = threading.Thread(target=idle_checker, daemon=True)
+    checker_thread.start()
+
+    async with server:
+        await stop.wait()
+
+
 def run_server(port: int, state_dir: str):
-    """Run the OTEL receiver server."""
+    """Run the OTEL receiver server.
+
+    Uses the asyncio/httptools front end when httptools is installed (on
+    uvloop if available), otherwise the threaded http.server one.
+    """
     receiver = OTELReceiver(state_dir)
+
+    if httptools is not None:
+        if uvloop is not None and hasattr(uvloop, "run"):
+            uvloop.run(serve_httptools(receiver, port))
+        else:
+            if uvloop is not None:
+                uvloop.install()  # uvloop < 0.18 has no uvloop.run
+            asyncio.run(serve_httptools(receiver, port))
+        return
+
     server = OTELHTTPServer(("127.0.0.1", port), OTELRequestHandler, receiver)
 
     print(f"OTEL receiver listening on http://127.0.0.1:{port}", file=sys.stderr)
@@ -389,13 +1237,9 @@ def run_server(port: int, state_dir: str):
 
     # Start idle checker thread
     def idle_checker():
-        while True:
-            time.sleep(60)  # Check every minute
-            receiver.cleanup_stale_mappings()
-            if receiver.is_idle():
-                print("Idle timeout reached, shutting down...", file=sys.stderr)
-                server.shutdown()
-                break
+        receiver.wait_until_idle()
+        print("Idle timeout reached, shutting down...", file=sys.stderr)
+        server.shutdown()
 
     checker_thread = threading.Thread(target=idle_checker, daemon=True)
     checker_thread.start()
@@ -1074,6 +1074,563 @@ test_otel_receiver_tool_result_success() {
     teardown
 }
 
+test_otel_receiver_keep_alive() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py HTTP/1.1 keep-alive...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14329
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Two requests in one curl invocation should share a single connection
+    local connects
+    connects=$(curl -s --max-time 2 -o /dev/null -o /dev/null -w '%{num_connects} ' \
+        "http://127.0.0.1:${test_port}/health" "http://127.0.0.1:${test_port}/health" 2>/dev/null || echo "")
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    assert_eq "1 0 " "$connects" "otel-receiver reuses keep-alive connections"
+
+    teardown
+}
+
+test_otel_receiver_idle_connections() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py idle keep-alive connections don't starve workers...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14333
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Hold one idle connection per worker thread, half of them after a request
+    local worker_threads
+    worker_threads=$(sed -n 's/^WORKER_THREADS = \([0-9]*\).*/\1/p' "${PLUGIN_DIR}/scripts/otel-receiver.py")
+    local ready_file="${TEST_STATE_DIR}/idle-ready"
+    python3 - "$test_port" "$worker_threads" "$ready_file" > /dev/null 2>&1 <<'PYEOF' &
+import socket, sys, time
+port, count, ready_file = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+connections = []
+for i in range(count):
+    sock = socket.create_connection(("127.0.0.1", port))
+    if i % 2:
+        sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        sock.recv(4096)
+    connections.append(sock)
+open(ready_file, "w").close()
+time.sleep(10)
+PYEOF
+    local client_pid=$!
+
+    waited=0
+    while [[ ! -f "$ready_file" ]] && [[ $waited -lt 50 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    local health_status
+    health_status=$(curl -s --max-time 2 "http://127.0.0.1:${test_port}/health" 2>/dev/null | jq -r '.status' 2>/dev/null || echo "")
+
+    kill "$client_pid" 2>/dev/null || true
+    wait "$client_pid" 2>/dev/null || true
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    assert_eq "ok" "$health_status" "otel-receiver answers /health while every worker's worth of connections idles"
+
+    teardown
+}
+
+test_otel_receiver_batch_latest_state() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py batch keeps latest state per pane...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14330
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Register a pane first
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/register" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "%100"}' > /dev/null 2>&1
+
+    # Send a batch where the last record needs approval
+    local otlp_payload='{
+        "resourceLogs": [{
+            "scopeLogs": [{
+                "logRecords": [
+                    {
+                        "attributes": [
+                            {"key": "event.name", "value": {"stringValue": "codex.conversation_starts"}},
+                            {"key": "conversation_id", "value": {"stringValue": "conv-batch-1"}}
+                        ]
+                    },
+                    {
+                        "attributes": [
+                            {"key": "event.name", "value": {"stringValue": "codex.response"}},
+                            {"key": "conversation_id", "value": {"stringValue": "conv-batch-1"}}
+                        ]
+                    },
+                    {
+                        "attributes": [
+                            {"key": "event.name", "value": {"stringValue": "codex.tool_decision"}},
+                            {"key": "conversation_id", "value": {"stringValue": "conv-batch-1"}},
+                            {"key": "status", "value": {"stringValue": "pending"}},
+                            {"key": "tool_name", "value": {"stringValue": "shell"}}
+                        ]
+                    }
+                ]
+            }]
+        }]
+    }'
+
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/v1/logs" \
+        -H "Content-Type: application/json" \
+        -d "$otlp_payload" > /dev/null 2>&1
+
+    sleep 0.3
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    # Check state
+    if [[ -f "${TEST_STATE_DIR}/100.state" ]]; then
+        local status
+        status=$(jq -r '.status' "${TEST_STATE_DIR}/100.state" 2>/dev/null || echo "")
+        assert_eq "attention" "$status" "otel-receiver keeps latest state from a batch"
+    else
+        fail "otel-receiver keeps latest state from a batch" "file exists" "file not found"
+    fi
+
+    teardown
+}
+
+test_otel_receiver_no_mappings() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py ignores OTLP data with no registered panes...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14331
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Body is not decoded when nothing is registered, so even invalid JSON is accepted
+    local response
+    response=$(curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/v1/logs" \
+        -H "Content-Type: application/json" \
+        -d 'not json' 2>/dev/null || echo "")
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    if [[ "$response" == *'"status"'*'"ok"'* ]]; then
+        pass "otel-receiver accepts OTLP data with no registered panes"
+    else
+        fail "otel-receiver accepts OTLP data with no registered panes" "status: ok" "$response"
+    fi
+
+    local state_count
+    state_count=$(find "$TEST_STATE_DIR" -name '*.state' | wc -l | tr -d ' ')
+    assert_eq "0" "$state_count" "otel-receiver writes no state with no registered panes"
+
+    teardown
+}
+
+test_otel_receiver_protobuf() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py OTLP/protobuf logs...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14334
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Register a pane first
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/register" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "%555"}' > /dev/null 2>&1
+
+    # Encode an ExportLogsServiceRequest with a conversation_starts event
+    # carrying an int_value conversation_id
+    local payload_file="${TEST_STATE_DIR}/logs.pb"
+    python3 - "$payload_file" <<'PYEOF'
+import sys
+from opentelemetry.proto.collector.logs.v1.logs_service_pb2 import ExportLogsServiceRequest
+request = ExportLogsServiceRequest()
+record = request.resource_logs.add().scope_logs.add().log_records.add()
+attribute = record.attributes.add()
+attribute.key = "event.name"
+attribute.value.string_value = "codex.conversation_starts"
+attribute = record.attributes.add()
+attribute.key = "conversation_id"
+attribute.value.int_value = 7
+with open(sys.argv[1], "wb") as f:
+    f.write(request.SerializeToString())
+PYEOF
+
+    local response
+    response=$(curl -s --max-time 2 -o /dev/null -w '%{http_code} %{content_type}' -X POST "http://127.0.0.1:${test_port}/v1/logs" \
+        -H "Content-Type: application/x-protobuf" \
+        --data-binary "@${payload_file}" 2>/dev/null || echo "")
+
+    local mappings
+    mappings=$(curl -s --max-time 2 "http://127.0.0.1:${test_port}/health" 2>/dev/null | jq -r '.mappings' 2>/dev/null || echo "")
+
+    sleep 0.3
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    assert_eq "200 application/x-protobuf" "$response" "otel-receiver answers protobuf exports with a protobuf response"
+    assert_eq "1" "$mappings" "otel-receiver keeps the mapping for an int_value conversation_id"
+    if [[ -f "${TEST_STATE_DIR}/555.state" ]]; then
+        assert_json_field "${TEST_STATE_DIR}/555.state" ".status" "running" "otel-receiver processes protobuf log records"
+    else
+        fail "otel-receiver processes protobuf log records" "file exists" "file not found"
+    fi
+
+    teardown
+}
+
+test_otel_receiver_httptools() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py httptools front end...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14335
+    local log_file="${TEST_STATE_DIR}/receiver.log"
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2> "$log_file" &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # On one connection: a register round trip, then two pipelined requests
+    # in a single write. Prints one "status body" line per response.
+    local responses
+    responses=$(python3 - "$test_port" 2>/dev/null <<'PYEOF'
+import socket, sys
+sock = socket.create_connection(("127.0.0.1", int(sys.argv[1])), timeout=2)
+reader = sock.makefile("rb")
+
+def request(method, path, body=b""):
+    return (f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body
+
+def read_response():
+    status = reader.readline().split()[1].decode()
+    length = 0
+    while (line := reader.readline().strip()):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    print(status, reader.read(length).decode())
+
+sock.sendall(request("POST", "/register", b'{"pane_id": "%444", "conversation_id": "conv-ht-1"}'))
+read_response()
+sock.sendall(request("GET", "/health") + request("POST", "/unregister", b'{"pane_id": "%444"}'))
+read_response()
+read_response()
+PYEOF
+    ) || responses=""
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    local front_end=""
+    if grep -q "(httptools)" "$log_file" 2>/dev/null; then
+        front_end="httptools"
+    fi
+    assert_eq "httptools" "$front_end" "otel-receiver uses httptools front end when available"
+
+    # Compare fields rather than bytes: json_dumps output differs with and without orjson
+    local register_result health_result unregister_result
+    register_result=$(echo "$responses" | sed -n 1p | { read -r code body; echo "$code $(echo "$body" | jq -r '.mapping_key' 2>/dev/null)"; })
+    health_result=$(echo "$responses" | sed -n 2p | { read -r code body; echo "$code $(echo "$body" | jq -r '.mappings' 2>/dev/null)"; })
+    unregister_result=$(echo "$responses" | sed -n 3p | { read -r code body; echo "$code $(echo "$body" | jq -r '.status' 2>/dev/null)"; })
+    assert_eq "200 conv-ht-1" "$register_result" "httptools front end registers a pane"
+    assert_eq "200 1" "$health_result" "httptools front end keeps the connection alive and sees the registered pane"
+    assert_eq "200 unregistered" "$unregister_result" "httptools front end answers pipelined requests"
+
+    teardown
+}
+
+test_otel_receiver_int_conversation_id() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py non-string conversation IDs...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14336
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Register a pane first
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/register" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "%333"}' > /dev/null 2>&1
+
+    # An intValue conversation_id claims the pending mapping
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/v1/logs" \
+        -H "Content-Type: application/json" \
+        -d '{"resourceLogs": [{"scopeLogs": [{"logRecords": [{"attributes": [
+                {"key": "event.name", "value": {"stringValue": "codex.conversation_starts"}},
+                {"key": "conversation_id", "value": {"intValue": "42"}}
+            ]}]}]}]}' > /dev/null 2>&1
+
+    # Later events for the same conversation still reach the pane
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/v1/logs" \
+        -H "Content-Type: application/json" \
+        -d '{"resourceLogs": [{"scopeLogs": [{"logRecords": [{"attributes": [
+                {"key": "event.name", "value": {"stringValue": "codex.tool_decision"}},
+                {"key": "conversation_id", "value": {"stringValue": "42"}},
+                {"key": "status", "value": {"stringValue": "pending"}}
+            ]}]}]}]}' > /dev/null 2>&1
+
+    local mappings
+    mappings=$(curl -s --max-time 2 "http://127.0.0.1:${test_port}/health" 2>/dev/null | jq -r '.mappings' 2>/dev/null || echo "")
+
+    sleep 0.3
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    assert_eq "1" "$mappings" "otel-receiver keeps the mapping for an intValue conversation_id"
+    if [[ -f "${TEST_STATE_DIR}/333.state" ]]; then
+        assert_json_field "${TEST_STATE_DIR}/333.state" ".status" "attention" "otel-receiver routes later events for an intValue conversation_id"
+    else
+        fail "otel-receiver routes later events for an intValue conversation_id" "file exists" "file not found"
+    fi
+
+    teardown
+}
+
+test_otel_receiver_malformed_record() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py skips malformed records in a batch...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14337
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # Register a pane first
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/register" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "%222"}' > /dev/null 2>&1
+
+    # A valid approval prompt followed by a record with malformed attributes
+    curl -s --max-time 2 -X POST "http://127.0.0.1:${test_port}/v1/logs" \
+        -H "Content-Type: application/json" \
+        -d '{"resourceLogs": [{"scopeLogs": [{"logRecords": [
+                {"attributes": [
+                    {"key": "event.name", "value": {"stringValue": "codex.tool_decision"}},
+                    {"key": "conversation_id", "value": {"stringValue": "conv-malformed-1"}},
+                    {"key": "status", "value": {"stringValue": "pending"}}
+                ]},
+                {"attributes": ["bogus"]}
+            ]}]}]}' > /dev/null 2>&1
+
+    sleep 0.3
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    if [[ -f "${TEST_STATE_DIR}/222.state" ]]; then
+        assert_json_field "${TEST_STATE_DIR}/222.state" ".status" "attention" "otel-receiver applies valid records alongside a malformed one"
+    else
+        fail "otel-receiver applies valid records alongside a malformed one" "file exists" "file not found"
+    fi
+
+    teardown
+}
+
+test_otel_receiver_tmux_control() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py tmux control mode client...${NC}"
+    setup
+
+    # Private tmux server so the control client never touches the user's sessions
+    local socket_name="tmux-stat-test-$$"
+    tmux -L "$socket_name" -f /dev/null new-session -d -s test 2>/dev/null
+    local socket_path pane_id window_id
+    socket_path=$(tmux -L "$socket_name" display-message -p '#{socket_path}' 2>/dev/null || echo "")
+    pane_id=$(tmux -L "$socket_name" display-message -p '#{pane_id}' 2>/dev/null || echo "")
+    window_id=$(tmux -L "$socket_name" display-message -p '#{window_id}' 2>/dev/null || echo "")
+
+    # Prints the output block, the %error result, the multi-line rejection,
+    # and the window the receiver's tmux worker resolved for the pane
+    local results
+    results=$(TMUX="${socket_path},0,0" python3 - "${PLUGIN_DIR}/scripts/otel-receiver.py" "$TEST_STATE_DIR" "$pane_id" 2>/dev/null <<'PYEOF'
+import importlib.util, json, sys, time
+spec = importlib.util.spec_from_file_location("otel_receiver", sys.argv[1])
+otel_receiver = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(otel_receiver)
+state_dir, pane_id = sys.argv[2], sys.argv[3]
+
+control = otel_receiver.TmuxControl()
+print(json.dumps(control.command("display-message -p 'one two'")))
+print(json.dumps(control.command("no-such-command")))
+try:
+    control.command("display-message -p one\nkill-server")
+    print("accepted")
+except ValueError:
+    print("rejected")
+
+receiver = otel_receiver.OTELReceiver(state_dir)
+receiver._write_state(pane_id, "running", "conv-tmux-1", "Testing")
+state_file = f"{state_dir}/{pane_id.lstrip('%')}.state"
+window = ""
+for _ in range(20):
+    with open(state_file) as f:
+        window = json.load(f)["tmux_window"]
+    if window:
+        break
+    time.sleep(0.1)
+print(window)
+PYEOF
+    ) || results=""
+
+    tmux -L "$socket_name" kill-server 2>/dev/null || true
+    [[ -n "$socket_path" ]] && rm -f "$socket_path"
+
+    assert_eq '["one two"]' "$(echo "$results" | sed -n 1p)" "TmuxControl returns the %begin/%end output block"
+    assert_eq "null" "$(echo "$results" | sed -n 2p)" "TmuxControl returns None on %error"
+    assert_eq "rejected" "$(echo "$results" | sed -n 3p)" "TmuxControl rejects multi-line commands"
+    assert_eq "$window_id" "$(echo "$results" | sed -n 4p)" "otel-receiver resolves the pane's window through the control client"
+
+    teardown
+}
+
+test_otel_receiver_rejects_invalid_ids() {
+    echo -e "\n${YELLOW}Testing otel-receiver.py rejects invalid pane and conversation IDs...${NC}"
+    setup
+
+    # Start receiver on a test port
+    local test_port=14332
+    export STATE_DIR="$TEST_STATE_DIR"
+    "${PLUGIN_DIR}/scripts/otel-receiver.py" --port "$test_port" --state-dir "$TEST_STATE_DIR" > /dev/null 2>&1 &
+    local receiver_pid=$!
+
+    # Wait for startup
+    local waited=0
+    while ! curl -s --connect-timeout 1 "http://127.0.0.1:${test_port}/health" > /dev/null 2>&1 && [[ $waited -lt 20 ]]; do
+        sleep 0.1
+        ((waited++)) || true
+    done
+
+    # A newline would end the command in tmux control mode
+    local register_code unregister_code conversation_code
+    register_code=$(curl -s --max-time 2 -o /dev/null -w '%{http_code}' -X POST "http://127.0.0.1:${test_port}/register" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "%9\nrun-shell \"true\""}' 2>/dev/null || echo "")
+    unregister_code=$(curl -s --max-time 2 -o /dev/null -w '%{http_code}' -X POST "http://127.0.0.1:${test_port}/unregister" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "../9"}' 2>/dev/null || echo "")
+    conversation_code=$(curl -s --max-time 2 -o /dev/null -w '%{http_code}' -X POST "http://127.0.0.1:${test_port}/register" \
+        -H "Content-Type: application/json" \
+        -d '{"pane_id": "%9", "conversation_id": 5}' 2>/dev/null || echo "")
+
+    # Stop receiver
+    kill -TERM "$receiver_pid" 2>/dev/null || true
+    sleep 0.2
+    kill -9 "$receiver_pid" 2>/dev/null || true
+    wait "$receiver_pid" 2>/dev/null || true
+
+    assert_eq "400" "$register_code" "otel-receiver register rejects invalid pane_id"
+    assert_eq "400" "$unregister_code" "otel-receiver unregister rejects invalid pane_id"
+    assert_eq "400" "$conversation_code" "otel-receiver register rejects non-string conversation_id"
+
+    teardown
+}
+
 # ============================================================
 # Test: codex-wrapper.sh
 # ============================================================
@@ -1279,6 +1836,28 @@ if command -v python3 &> /dev/null && command -v curl &> /dev/null; then
     test_otel_receiver_conversation_ends
     test_otel_receiver_tool_decision_approved
     test_otel_receiver_tool_result_success
+    test_otel_receiver_keep_alive
+    test_otel_receiver_idle_connections
+    test_otel_receiver_batch_latest_state
+    test_otel_receiver_no_mappings
+    test_otel_receiver_rejects_invalid_ids
+    test_otel_receiver_int_conversation_id
+    test_otel_receiver_malformed_record
+    if python3 -c "import opentelemetry.proto" &> /dev/null; then
+        test_otel_receiver_protobuf
+    else
+        echo -e "${YELLOW}Skipping OTLP/protobuf test (opentelemetry-proto not available)${NC}"
+    fi
+    if python3 -c "import httptools" &> /dev/null; then
+        test_otel_receiver_httptools
+    else
+        echo -e "${YELLOW}Skipping httptools front end test (httptools not available)${NC}"
+    fi
+    if command -v tmux &> /dev/null; then
+        test_otel_receiver_tmux_control
+    else
+        echo -e "${YELLOW}Skipping tmux control mode test (tmux not available)${NC}"
+    fi
 else
     echo -e "${YELLOW}Skipping OTEL receiver tests (python3 or curl not available)${NC}"
 fi